@@ -0,0 +1,249 @@
+import numpy as np
+import multiprocessing as mp
+from simulation import column, REVENUE, DEPARTURE
+
+# Locations of the chain, set once per worker process by the pool initializer
+worker_locations = None
+
+
+def init_worker(locations):
+    global worker_locations
+    worker_locations = locations
+
+
+def run_location(locations, task):
+    """
+    Simulate one location under the given staffing and inventory, once per seed.
+    Returns the location's metrics averaged over the runs.
+    """
+    index, num_cooks, num_servers, inventory, seeds = task
+    simulator = locations[index]
+    simulator.num_cooks = num_cooks
+    simulator.num_servers = num_servers
+    simulator.set_inventory(inventory)
+
+    profit, revenue, served, dissatisfaction = [], [], [], []
+    for seed in seeds:
+        np.random.seed(seed)
+        simulator.run_simulation()
+        log = simulator.log[:simulator.customer_counter]
+        profit.append(simulator.calculate_profit())
+        revenue.append(np.nansum(log[:, REVENUE]))
+        served.append(np.count_nonzero(~np.isnan(log[:, DEPARTURE])))
+        dissatisfaction.append(simulator.customer_dissatisfaction)
+    return {
+        "profit": np.mean(profit),
+        "revenue": np.mean(revenue),
+        "customers_served": np.mean(served),
+        "customer_dissatisfaction": np.mean(dissatisfaction),
+        "num_cooks": num_cooks,
+        "num_servers": num_servers,
+        "inventory": inventory,
+    }
+
+
+def run_location_in_worker(task):
+    return run_location(worker_locations, task)
+
+
+def fit_to_pool(requested, capacity):
+    """
+    Scale requested amounts down so that they sum to at most `capacity`.
+    Units lost to rounding go to the largest fractional shares.
+    """
+    requested = np.maximum(np.asarray(requested, dtype=np.int64), 0)
+    total = requested.sum()
+    if total <= capacity:
+        return requested
+    shares = requested * capacity / total
+    granted = np.floor(shares).astype(np.int64)
+    remainder = int(capacity - granted.sum())
+    granted[np.argsort(granted - shares)[:remainder]] += 1
+    return granted
+
+
+class RestaurantChain:
+    def __init__(self, locations, central_inventory=None, staff_pool=None,
+                 central_inventory_discount=0.0, processes=None):
+        """
+        Simulate several restaurant locations together, sharded across worker processes.
+
+        Parameters:
+        - locations (list of RestaurantSimulator): One simulator per location, each with its own arrival rates, menu and staff.
+        - central_inventory (DataFrame or dict): Central kitchen stock with columns ['Dish', 'Quantity'] that can be
+          transferred to the locations before service.
+        - staff_pool (tuple): (total_cooks, total_servers) shared by all locations. Requests above the pool are scaled down.
+        - central_inventory_discount (float): Fraction of the cost charged for central stock that is not transferred.
+        - processes (int): Number of worker processes. Defaults to the number of cores; 1 runs everything in this process.
+
+        A parameter vector holds [num_cooks, num_servers, inventory...] for each location in turn, followed by
+        the transfer of each central dish to each location that has it on its menu.
+        """
+        self.locations = locations
+        self.staff_pool = staff_pool
+        self.central_inventory_discount = central_inventory_discount
+        self.processes = processes if processes is not None else mp.cpu_count()
+        self.pool = None
+
+        if central_inventory is None:
+            self.central_dishes = np.array([])
+            self.central_stock = np.zeros(0, dtype=np.int64)
+        else:
+            self.central_dishes = column(central_inventory, 'Dish')
+            self.central_stock = np.maximum(column(central_inventory, 'Quantity').astype(np.int64), 0)
+
+        # (location, menu index, central index) for every dish the central kitchen can send
+        self.transfer_routes = []
+        for c, dish in enumerate(self.central_dishes):
+            for index, location in enumerate(self.locations):
+                matches = np.flatnonzero(location.dishes == dish)
+                if len(matches):
+                    self.transfer_routes.append((index, matches[0], c))
+
+        self.central_cost = np.zeros(len(self.central_dishes))
+        for index, menu_index, c in self.transfer_routes:
+            self.central_cost[c] = self.locations[index].dish_cost[menu_index]
+
+        self.last_result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # A pool cannot be pickled; copies sent to other processes start their own when needed
+        state = self.__dict__.copy()
+        state['pool'] = None
+        return state
+
+    def close(self):
+        """
+        Shut down the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def get_pool(self):
+        # Locations are sent to each worker once, so changes made to them afterwards need a close()
+        if self.pool is None:
+            self.pool = mp.Pool(self.processes, initializer=init_worker, initargs=(self.locations,))
+        return self.pool
+
+    def param_kinds(self):
+        """
+        Return 'staff', 'inventory' or 'transfer' for every dimension of the parameter vector.
+        """
+        kinds = []
+        for location in self.locations:
+            kinds.extend(['staff', 'staff'] + ['inventory'] * len(location.dishes))
+        kinds.extend(['transfer'] * len(self.transfer_routes))
+        return kinds
+
+    def bounds(self, staff_bounds=(1, 10), inventory_bounds=(0, 1000)):
+        """
+        Return (lower_bound, upper_bound) for every dimension of the parameter vector.
+        Transfers are bounded by the central stock of the dish.
+        """
+        bounds = []
+        for location in self.locations:
+            bounds.extend([staff_bounds, staff_bounds] + [inventory_bounds] * len(location.dishes))
+        bounds.extend((0, int(self.central_stock[c])) for _, _, c in self.transfer_routes)
+        return bounds
+
+    def unpack_params(self, params):
+        """
+        Split a parameter vector into per-location (num_cooks, num_servers, inventory),
+        after applying the staff pool and the central kitchen transfers.
+        Returns the per-location settings and the central stock left over.
+        """
+        params = np.asarray(params)
+        cooks, servers, inventories = [], [], []
+        offset = 0
+        for location in self.locations:
+            cooks.append(params[offset])
+            servers.append(params[offset + 1])
+            inventories.append(np.maximum(np.array(params[offset + 2:offset + 2 + len(location.dishes)], dtype=np.int64), 0))
+            offset += 2 + len(location.dishes)
+
+        if self.staff_pool is not None:
+            cooks = fit_to_pool(cooks, self.staff_pool[0])
+            servers = fit_to_pool(servers, self.staff_pool[1])
+
+        leftover = self.central_stock.copy()
+        if self.transfer_routes:
+            requested = np.maximum(np.array(params[offset:offset + len(self.transfer_routes)], dtype=np.int64), 0)
+            central = np.array([c for _, _, c in self.transfer_routes])
+            for c in range(len(self.central_dishes)):
+                routes = np.flatnonzero(central == c)
+                requested[routes] = fit_to_pool(requested[routes], self.central_stock[c])
+                leftover[c] -= requested[routes].sum()
+            for (index, menu_index, _), amount in zip(self.transfer_routes, requested):
+                inventories[index][menu_index] += amount
+
+        settings = [(int(max(cook, 0)), int(max(server, 0)), inventory)
+                    for cook, server, inventory in zip(cooks, servers, inventories)]
+        return settings, leftover
+
+    def location_seeds(self, seed, num_runs):
+        """
+        Derive one seed per (location, run). Configurations evaluated with the same base seed
+        see the same customers at each location, so comparisons between them use common random numbers.
+        """
+        return [[int(np.random.SeedSequence([seed, index, run]).generate_state(1)[0]) for run in range(num_runs)]
+                for index in range(len(self.locations))]
+
+    def evaluate_batch(self, param_list, num_runs=1, seed=None):
+        """
+        Simulate every location under every parameter vector in parallel.
+
+        Parameters:
+        - param_list (list of arrays): Chain parameter vectors.
+        - num_runs (int): Simulations per location, averaged.
+        - seed (int): Base seed shared by the whole batch. Drawn from np.random when None.
+
+        Returns:
+        - results (list of dict): For each vector, the chain profit and the metrics of each location.
+        """
+        if seed is None:
+            seed = np.random.randint(2**31 - 1)
+        seeds = self.location_seeds(seed, num_runs)
+
+        tasks, leftovers = [], []
+        for params in param_list:
+            settings, leftover = self.unpack_params(params)
+            leftovers.append(leftover)
+            for index, (num_cooks, num_servers, inventory) in enumerate(settings):
+                tasks.append((index, num_cooks, num_servers, inventory, seeds[index]))
+
+        if self.processes == 1:
+            # run_location seeds the global RNG, which the optimizers calling us also draw from
+            state = np.random.get_state()
+            try:
+                outcomes = [run_location(self.locations, task) for task in tasks]
+            finally:
+                np.random.set_state(state)
+        else:
+            outcomes = self.get_pool().map(run_location_in_worker, tasks)
+
+        results = []
+        num_locations = len(self.locations)
+        for i, leftover in enumerate(leftovers):
+            locations = outcomes[i * num_locations:(i + 1) * num_locations]
+            central_costs = self.central_inventory_discount * (self.central_cost * leftover).sum()
+            results.append({
+                "profit": sum(location["profit"] for location in locations) - central_costs,
+                "locations": locations,
+                "central_leftover": leftover,
+            })
+        return results
+
+    def evaluate(self, params, num_runs=1, seed=None):
+        """
+        Return the chain-level profit of one parameter vector. Used by DifferentialEvolution and PSOOptimizer.
+        """
+        self.last_result = self.evaluate_batch([params], num_runs, seed)[0]
+        return self.last_result["profit"]
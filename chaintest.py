@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from simulation import RestaurantSimulator
+from chain import RestaurantChain, fit_to_pool
+from diffev import DifferentialEvolution
+from particleswarm import PSOOptimizer
+
+def make_location(dishes, costs, prices, prep_times, demand, arrival_rates, seating_capacity):
+    menu_df = pd.DataFrame({
+        'Dish': dishes,
+        'Cost': costs,
+        'SalePrice': prices,
+        'PrepTime': prep_times,
+        'DemandRating': demand
+    })
+    inventory_df = pd.DataFrame({'Dish': dishes, 'Quantity': [100] * len(dishes)})
+    return RestaurantSimulator(
+        duration=len(arrival_rates),
+        arrival_rates=arrival_rates,
+        menu_df=menu_df,
+        seating_capacity=seating_capacity,
+        num_cooks=3,
+        num_servers=2,
+        inventory_df=inventory_df,
+        server_capacity=10,
+        cook_capacity=3,
+        cook_wage=17.5, # Data from Bosso meeting
+        server_wage=6.75, # Data from Bosso meeting
+        avg_consumption_time=1.
+    )
+
+downtown = make_location(
+    ['Ramen', 'Sushi', 'Tsunami', 'Sakana/Okazu'], [2.5, 2, 2, 3], [17, 6.5, 9, 19],
+    [0.0167+5/60, 0.0083 + 5/60, 0.0416 + 5/60, 0.0416 + 5/60], [200/407, 67/407, 82/407, 158/407],
+    [3 * i for i in [3, 38, 16, 2, 41, 44, 44, 34, 13, 4, 1]], 60)
+campus = make_location(
+    ['Ramen', 'Sushi'], [2.5, 2], [15, 6],
+    [0.0167+5/60, 0.0083 + 5/60], [0.7, 0.3],
+    [20, 60, 30, 10, 50, 40], 30)
+airport = make_location(
+    ['Ramen', 'Tsunami'], [2.5, 2], [19, 11],
+    [0.0167+5/60, 0.0416 + 5/60], [0.5, 0.5],
+    [40] * 8, 40)
+
+# Central kitchen stock that can be sent to any location serving the dish
+central_inventory = pd.DataFrame({'Dish': ['Ramen', 'Sushi'], 'Quantity': [600, 200]})
+
+if __name__ == "__main__":
+    # Staff and central stock requests are scaled down to exactly fill the pool, never above any request
+    for requested, capacity in [([5, 5, 5], 12), ([7, 1, 3], 8), ([2, 3, 0], 10), ([4, -2, 9], 6), ([1, 1, 1], 2)]:
+        granted = fit_to_pool(requested, capacity)
+        assert granted.sum() == min(sum(max(r, 0) for r in requested), capacity)
+        assert all(0 <= g <= max(r, 0) for g, r in zip(granted, requested))
+
+    with RestaurantChain([downtown, campus, airport], central_inventory=central_inventory,
+                         staff_pool=(12, 8), central_inventory_discount=0.2) as chain:
+        bounds = chain.bounds(staff_bounds=(1, 6), inventory_bounds=(0, 500))
+
+        # The pool and a single process see the same customers for the same seed
+        params = [int(np.mean(bound)) for bound in bounds]
+        serial = RestaurantChain(chain.locations, central_inventory=central_inventory, staff_pool=(12, 8),
+                                 central_inventory_discount=0.2, processes=1)
+        assert chain.evaluate_batch([params], num_runs=2, seed=1)[0]['profit'] == serial.evaluate_batch([params], num_runs=2, seed=1)[0]['profit']
+
+        optimizer = DifferentialEvolution(
+            simulator=chain,
+            bounds=bounds,
+            population_size=20,
+            mutation_factor=0.8,
+            crossover_rate=0.5,
+            generations=20,
+        )
+        settings, central_leftover = optimizer.optimize()
+        print("Best chain profit (DE):", optimizer.best_profit)
+        for name, (num_cooks, num_servers, inventory) in zip(['Downtown', 'Campus', 'Airport'], settings):
+            print(f"{name}: {num_cooks} cooks, {num_servers} servers, inventory {inventory}")
+        print("Central kitchen leftover:", central_leftover)
+
+        swarm = PSOOptimizer(None, chain, swarm_size=20, max_iter=20, bounds=bounds)
+        best_position, best_profit = swarm.optimize()
+        print("Best chain profit (PSO):", best_profit)
+
+        # Per-location metrics for the DE solution, averaged over 10 runs
+        result = chain.evaluate_batch([optimizer.best_params], num_runs=10)[0]
+        print("Chain profit:", result['profit'])
+        for name, metrics in zip(['Downtown', 'Campus', 'Airport'], result['locations']):
+            print(name, metrics)
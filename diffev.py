@@ -1,6 +1,6 @@
 import numpy as np
 from simulation import RestaurantSimulator
-import pandas as pd
+from polish import IntegerLocalSearch
 import time
 
 class DifferentialEvolution:
@@ -26,6 +26,10 @@ class DifferentialEvolution:
 
         # Placeholder for the population initialization
         self.population = None
+        self.fitness = None
+        self.trials = None
+        self.best_profit = -float('inf')
+        self.best_params = None
 
     def initialize_population(self):
         """
@@ -87,11 +91,14 @@ class DifferentialEvolution:
         Define the objective function to minimize (e.g., negative profit).
         This should use the RestaurantSimulator instance to evaluate the performance.
         """
+        if hasattr(self.simulator, "evaluate"):
+            # Chains lay out and evaluate their own parameter vectors
+            return self.simulator.evaluate(params, num_runs)
         num_cooks, num_servers, inventory_list = self.unpack_params(params)
 
         self.simulator.num_cooks = num_cooks
         self.simulator.num_servers = num_servers
-        self.simulator.init_inventory_df['Quantity'] = inventory_list
+        self.simulator.set_inventory(inventory_list)
         profit = []
         for _ in range(num_runs):
             self.simulator.run_simulation()
@@ -105,48 +112,149 @@ class DifferentialEvolution:
         inventory_list = np.array(params[2:], dtype=int)
         return num_cooks, num_servers, inventory_list
     
+    def unpack_best(self):
+        """
+        Unpack best_params: (num_cooks, num_servers, inventory_list) for a single simulator,
+        or the chain's per-location settings and central leftover for a RestaurantChain.
+        """
+        if hasattr(self.simulator, "unpack_params"):
+            return self.simulator.unpack_params(self.best_params)
+        return self.unpack_params(self.best_params)
+
     def pack_params (self, num_cooks, num_servers, inventory_list):
         params = [num_cooks, num_servers]
         params.extend(inventory_list)
         return params
 
+    def initialize(self):
+        """
+        Initialize the population and reset the best-so-far bookkeeping.
+        """
+        self.initialize_population()
+        self.fitness = np.full(self.population_size, -np.inf)
+        self.best_profit = -float('inf')
+        self.best_params = None
+
+    def evaluate_population(self, vectors, num_runs=1):
+        """
+        Return the objective function value of every vector.
+        """
+        if hasattr(self.simulator, "evaluate_batch"):
+            # Hand a chain the whole batch so its pool gets every (vector, location) pair at once
+            return [result["profit"] for result in self.simulator.evaluate_batch(vectors, num_runs)]
+        return [self.objective_function(vector, num_runs) for vector in vectors]
+
+    def step(self):
+        """
+        Evolve the population by one generation.
+        Returns True if all vectors in the population are identical.
+
+        Each trial vector is built from the population as updated by the previous ones. A chain
+        instead gets the whole generation as one batch through ask() and tell().
+        """
+        if hasattr(self.simulator, "evaluate_batch"):
+            return self.tell(self.evaluate_population(self.ask()))
+        for i in range(self.population_size):
+            # Select the target vector for the current individual
+            target_vector = self.population[i]
+            trial_vector = self.trial_vector(i)
+
+            # Select the best vector between target and trial based on objective function
+            best_vector, profit = self.select(target_vector, trial_vector)
+            self.update(i, best_vector, profit)
+
+            if np.all(self.population == self.population[0]):
+                return True
+        return False
+
+    def trial_vector(self, i):
+        """
+        Build the trial vector of individual i by mutation and recombination.
+        """
+        # Create a mutant vector through mutation
+        mutant_vector = self.mutate(i)
+
+        # Recombine target and mutant vectors to create a trial vector
+        trial_vector = self.recombine(self.population[i], mutant_vector)
+        return np.maximum(trial_vector, 0)  # Clamp values to 0 or higher
+
+    def update(self, i, vector, profit):
+        """
+        Store individual i and its profit, and update the best-so-far.
+        """
+        self.population[i] = vector
+        self.fitness[i] = profit
+        if profit > self.best_profit:
+            self.best_profit = profit
+            self.best_params = self.population[i].copy()
+
+    def ask(self):
+        """
+        Return the vectors to evaluate for one generation, for drivers that evaluate a whole
+        generation at once: every target vector followed by its trial vector. Unlike the serial
+        step(), all trials are built from the population at the start of the generation.
+        Pass the profits back to tell() in the same order.
+        """
+        if self.population is None:
+            self.initialize()
+        self.trials = np.array([self.trial_vector(i) for i in range(self.population_size)])
+        return np.concatenate([self.population, self.trials])
+
+    def tell(self, profits):
+        """
+        Keep the better of each target and trial vector given the profits of the vectors from ask().
+        Returns True if all vectors in the population are identical.
+        """
+        target_profits = profits[:self.population_size]
+        trial_profits = profits[self.population_size:]
+        for i in range(self.population_size):
+            if trial_profits[i] > target_profits[i]:
+                self.update(i, self.trials[i], trial_profits[i])
+            else:
+                self.update(i, self.population[i], target_profits[i])
+        return bool(np.all(self.population == self.population[0]))
+
+    def emigrants(self, count):
+        """
+        Return copies of the `count` fittest vectors and their profits.
+        """
+        order = np.argsort(self.fitness)[::-1][:count]
+        return self.population[order].copy(), self.fitness[order].copy()
+
+    def accept_immigrants(self, vectors, profits):
+        """
+        Replace the least fit members of the population with incoming vectors.
+        """
+        worst = np.argsort(self.fitness)[:len(vectors)]
+        for i, vector, profit in zip(worst, vectors, profits):
+            self.population[i] = np.maximum(vector, 0)
+            self.fitness[i] = profit
+            if profit > self.best_profit:
+                self.best_profit = profit
+                self.best_params = self.population[i].copy()
+
     def optimize(self):
         """
         Perform the Differential Evolution optimization loop.
         """
-        self.initialize_population()
-        best_profit = -float('inf')  
-        best_params = None
+        self.initialize()
         for g in range(self.generations):
             start_time = time.time()
-            for i in range(self.population_size):
-                # Select the target vector for the current individual
-                target_vector = self.population[i]
-                
-                # Create a mutant vector through mutation
-                mutant_vector = self.mutate(i)
-                
-                # Recombine target and mutant vectors to create a trial vector
-                trial_vector = self.recombine(target_vector, mutant_vector)
-                
-                trial_vector = np.maximum(trial_vector, 0)  # Clamp values to 0 or higher
-                # Select the best vector between target and trial based on objective function
-                best_vector, profit = self.select(target_vector, trial_vector)
-                
-                # Update the population
-                self.population[i] = best_vector
-
-                if profit > best_profit:
-                    best_profit = profit
-                    best_params = self.population[i]
-                
-                if np.all(self.population == self.population[0]):
-                    print(f"Convergence reached at generation {g}. All vectors are identical.")
-                    break
+            if self.step():
+                print(f"Convergence reached at generation {g}. All vectors are identical.")
             execution_time = time.time() - start_time
             print(f"Execution time: {execution_time} seconds")
     
             if g % 10 == 0:
-                print(f"Generation {g}: Best Objective Value = {best_profit}, Best Parameters = {best_params}")
+                print(f"Generation {g}: Best Objective Value = {self.best_profit}, Best Parameters = {self.best_params}")
+
+        return self.unpack_best()
 
-        return self.unpack_params(best_params)
+    def polish(self, **kwargs):
+        """
+        Refine best_params with an integer local search around it. best_profit becomes the
+        search's re-evaluated profit of the result. Keyword arguments are passed to IntegerLocalSearch.
+        """
+        search = IntegerLocalSearch(self.simulator, self.bounds, **kwargs)
+        self.best_params, self.best_profit = search.polish(self.best_params)
+        return self.unpack_best()
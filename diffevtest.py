@@ -38,6 +38,16 @@ simulation_params = {
 
 simulator = RestaurantSimulator(**simulation_params)
 
+# Profits of the original pandas simulator for these seeds; the NumPy event loop must reproduce them
+for seed, num_cooks, num_servers, expected in [(0, 9, 1, -881.75), (1, 3, 6, 4630.6), (2, 4, 4, 3587.8)]:
+    simulator.num_cooks = num_cooks
+    simulator.num_servers = num_servers
+    np.random.seed(seed)
+    simulator.run_simulation()
+    assert np.isclose(simulator.calculate_profit(), expected)
+simulator.num_cooks = simulation_params["num_cooks"]
+simulator.num_servers = simulation_params["num_servers"]
+
 # Define the bounds for the optimization (e.g., num_cooks, num_servers, inventory quantities)
 bounds = [
     (1, 6),  # num_cooks (1 to 10 cooks)
@@ -73,7 +83,7 @@ print(f"Inventory: {inventory_list[0]}")
 # Set the best parameters into the simulator
 simulator.num_cooks = num_cooks
 simulator.num_servers = num_servers
-simulator.inventory_df['Quantity'] = inventory_list[0]
+simulator.set_inventory(inventory_list[0])
 
 # Run the simulation with the optimized parameters
 simulator.run_simulation()
@@ -0,0 +1,370 @@
+import numpy as np
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing.connection import Listener, Client
+import threading
+import time
+from diffev import DifferentialEvolution
+from particleswarm import PSOOptimizer
+
+
+def ring_topology(num_islands):
+    """
+    Each island sends its migrants to the next island, wrapping around at the end.
+    """
+    return {i: [(i + 1) % num_islands] for i in range(num_islands)}
+
+
+def fully_connected_topology(num_islands):
+    """
+    Each island sends its migrants to every other island.
+    """
+    return {i: [j for j in range(num_islands) if j != i] for i in range(num_islands)}
+
+
+TOPOLOGIES = {
+    "ring": ring_topology,
+    "full": fully_connected_topology,
+}
+
+
+class PipeTransport:
+    """
+    Exchange migrants between islands on one machine over multiprocessing pipes.
+    Like SocketTransport, every island has a pipe to every other one, so that an island that
+    finishes can tell all of them to stop sending to it. A shared event tells every island to stop.
+    """
+    def __init__(self):
+        self.pipes = {}
+        self.stop_event = None
+
+    def setup(self, topology):
+        """
+        Create one pipe per ordered pair of islands and the stop event. Must run in the parent before the islands start.
+        """
+        self.pipes = {}
+        for source in topology:
+            for destination in topology:
+                if source != destination:
+                    self.pipes[(source, destination)] = mp.Pipe(duplex=False)
+        self.stop_event = mp.Event()
+
+    def release(self):
+        """
+        Close the parent's copies of the pipes once the islands have started. Otherwise a pipe
+        would stay open after the island reading from it has finished, and a neighbour still
+        writing to it would block once its buffer filled.
+        """
+        for reader, writer in self.pipes.values():
+            reader.close()
+            writer.close()
+
+    def open(self, island_id, topology):
+        """
+        Return the (inbound, outbound) connections of an island, keyed by peer id,
+        and close this process's copies of every pipe end the island does not use.
+        """
+        inbound, outbound = {}, {}
+        for (source, destination), (reader, writer) in self.pipes.items():
+            if destination == island_id:
+                inbound[source] = reader
+            else:
+                reader.close()
+            if source == island_id:
+                outbound[destination] = writer
+            else:
+                writer.close()
+        return inbound, outbound
+
+    def request_stop(self, outbound):
+        self.stop_event.set()
+
+    def stop_requested(self):
+        return self.stop_event.is_set()
+
+
+class SocketTransport:
+    """
+    Exchange migrants over TCP sockets so that islands can live on different nodes.
+    Every island connects to every other one, so that a stop message reaches all of them
+    directly; migrants still only travel along the topology.
+
+    Connections are authenticated with `authkey`, and messages are unpickled on arrival, so
+    anyone who knows the key can run code on the islands. Keep it secret.
+
+    Parameters:
+    - addresses (dict): Maps island id to the (host, port) it listens on. Defaults to
+      consecutive ports on `host` starting at `base_port`.
+    - authkey (bytes): Shared secret used to authenticate connections between islands. Required
+      with `addresses`, since every node must pass the same one. Otherwise a random key is
+      generated, which reaches the islands when they are started from this process.
+    - connect_timeout (float): Seconds to wait for the other islands to connect and be connected to.
+    """
+    def __init__(self, addresses=None, host="localhost", base_port=6100,
+                 authkey=None, connect_timeout=30.):
+        if authkey is None:
+            if addresses is not None:
+                raise ValueError("authkey is required with addresses; pass the same secret on every node")
+            authkey = os.urandom(32)
+        self.addresses = addresses
+        self.host = host
+        self.base_port = base_port
+        self.authkey = authkey
+        self.connect_timeout = connect_timeout
+
+    def setup(self, topology):
+        if self.addresses is None:
+            self.addresses = {i: (self.host, self.base_port + i) for i in topology}
+
+    def release(self):
+        # Each island opens its own sockets, so the parent holds none
+        pass
+
+    def open(self, island_id, topology):
+        """
+        Listen for every other island while connecting to each of them.
+        Accepting runs in a thread so that islands connecting to each other cannot deadlock.
+        """
+        listener = Listener(self.addresses[island_id], authkey=self.authkey)
+        peers = [peer for peer in topology if peer != island_id]
+        inbound = {}
+
+        def accept():
+            for _ in peers:
+                conn = listener.accept()
+                inbound[conn.recv()] = conn
+
+        acceptor = threading.Thread(target=accept, daemon=True)
+        acceptor.start()
+        outbound = {peer: self.connect(island_id, peer) for peer in peers}
+        acceptor.join(self.connect_timeout)
+        listener.close()
+        if len(inbound) < len(peers):
+            missing = sorted(set(peers) - set(inbound))
+            raise TimeoutError(f"Island {island_id} was not connected to by islands {missing} "
+                               f"within {self.connect_timeout} seconds")
+        return inbound, outbound
+
+    def request_stop(self, outbound):
+        broadcast(outbound, ("stop",))
+
+    def stop_requested(self):
+        # Stops arrive as messages, which run_island reads with the migrants
+        return False
+
+    def connect(self, island_id, destination):
+        deadline = time.time() + self.connect_timeout
+        while True:
+            try:
+                conn = Client(self.addresses[destination], authkey=self.authkey)
+                conn.send(island_id)
+                return conn
+            except ConnectionRefusedError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+
+
+def swap_staff(vectors):
+    """
+    Convert between the DE layout (num_cooks, num_servers, inventory...) and the
+    PSO layout (num_servers, num_cooks, inventory...). The swap is its own inverse.
+    """
+    vectors = np.array(vectors, copy=True)
+    vectors[..., [0, 1]] = vectors[..., [1, 0]]
+    return vectors
+
+
+def broadcast(outbound, message):
+    for conn in outbound.values():
+        try:
+            conn.send(message)
+        except OSError:
+            # The peer finished and closed its end before its "done" message arrived
+            pass
+
+
+def receive(inbound):
+    """
+    Return every (source, message) pair that has already arrived, without waiting for more.
+    """
+    messages = []
+    for source, conn in list(inbound.items()):
+        try:
+            while conn.poll():
+                messages.append((source, conn.recv()))
+        except (EOFError, OSError):
+            # The peer has finished and closed its end
+            del inbound[source]
+    return messages
+
+
+def run_island(island_id, optimizer, topology, transport, generations,
+               migration_interval, migration_size, target_profit, seed, results):
+    """
+    Evolve one island, sending migrants to its neighbours every `migration_interval` generations.
+    Incoming migrants are taken whenever they have arrived, so islands never wait for each other.
+    Every generation the island also checks whether any island has asked all of them to stop.
+    When it finishes, the island tells every other island it is done, so they stop sending to it.
+    Migrants always travel in the DE parameter layout.
+    """
+    np.random.seed(seed)
+    is_pso = isinstance(optimizer, PSOOptimizer)
+    inbound, outbound = transport.open(island_id, topology)
+    neighbours = {destination: outbound[destination] for destination in topology[island_id]}
+
+    def best():
+        if is_pso:
+            return optimizer.global_best_value, swap_staff(optimizer.global_best_position)
+        return optimizer.best_profit, optimizer.best_params
+
+    start_time = time.time()
+    optimizer.initialize()
+    generations_run = 0
+    target_reached = False
+    for g in range(generations):
+        optimizer.step()
+        generations_run = g + 1
+
+        stop = transport.stop_requested()
+        for source, message in receive(inbound):
+            if message[0] == "stop":
+                stop = True
+            elif message[0] == "done":
+                outbound.pop(source, None)
+                neighbours.pop(source, None)
+            else:
+                _, vectors, profits = message
+                optimizer.accept_immigrants(swap_staff(vectors) if is_pso else vectors, profits)
+        if stop:
+            # Another island hit the target
+            break
+
+        if target_profit is not None and best()[0] >= target_profit:
+            target_reached = True
+            transport.request_stop(outbound)
+            break
+
+        if generations_run % migration_interval == 0 and generations_run < generations:
+            vectors, profits = optimizer.emigrants(migration_size)
+            if is_pso:
+                vectors = swap_staff(vectors)
+            broadcast(neighbours, ("migrants", vectors, profits))
+
+    broadcast(outbound, ("done",))
+    best_profit, best_params = best()
+    results.put({
+        "island": island_id,
+        "optimizer": "pso" if is_pso else "de",
+        "best_profit": best_profit,
+        "best_params": best_params,
+        "generations": generations_run,
+        "elapsed": time.time() - start_time,
+        "target_reached": target_reached,
+    })
+    for conn in list(inbound.values()) + list(outbound.values()):
+        conn.close()
+
+
+class IslandModel:
+    def __init__(self, simulator, bounds, num_islands, generations,
+                 population_size=20, mutation_factor=0.8, crossover_rate=0.5,
+                 num_pso_islands=0, simulation_params=None,
+                 migration_interval=5, migration_size=1, topology="ring",
+                 transport=None, target_profit=None, seed=None):
+        """
+        Initialize an island-model optimizer, where each island is a separate process.
+
+        Parameters:
+        - simulator (RestaurantSimulator): An instance of the RestaurantSimulator class, copied into every island.
+        - bounds (list of tuples): List of (lower_bound, upper_bound) for each parameter, in the DE layout.
+        - num_islands (int): Total number of islands.
+        - generations (int): Number of generations (iterations) each island runs.
+        - population_size (int): Population size of DE islands and swarm size of PSO islands.
+        - mutation_factor (float), crossover_rate (float): DE settings for the DE islands.
+        - num_pso_islands (int): How many of the islands run PSO instead of DE.
+        - simulation_params (dict): Parameters passed to PSOOptimizer, required when num_pso_islands > 0.
+        - migration_interval (int): Number of generations between migrations.
+        - migration_size (int): Number of best individuals each island sends per migration.
+        - topology (str or dict): "ring", "full", or a dict mapping island id to the ids it sends to.
+        - transport (PipeTransport or SocketTransport): How migrants travel. Defaults to pipes.
+        - target_profit (float): Once any island reaches this profit, every island stops within a generation.
+        - seed (int): Base random seed; island i is seeded with seed + i.
+        """
+        if num_pso_islands > 0 and simulation_params is None:
+            raise ValueError("simulation_params is required for PSO islands")
+        if isinstance(topology, str):
+            topology = TOPOLOGIES[topology](num_islands)
+
+        self.simulator = simulator
+        self.bounds = bounds
+        self.num_islands = num_islands
+        self.generations = generations
+        self.population_size = population_size
+        self.mutation_factor = mutation_factor
+        self.crossover_rate = crossover_rate
+        self.num_pso_islands = num_pso_islands
+        self.simulation_params = simulation_params
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.transport = transport if transport is not None else PipeTransport()
+        self.target_profit = target_profit
+        self.seed = seed
+
+        self.island_results = None
+
+    def build_optimizer(self, island_id):
+        if island_id >= self.num_islands - self.num_pso_islands:
+            return PSOOptimizer(self.simulation_params, self.simulator,
+                                swarm_size=self.population_size, max_iter=self.generations,
+                                bounds=[self.bounds[1], self.bounds[0], *self.bounds[2:]])
+        return DifferentialEvolution(self.simulator, self.bounds, self.population_size,
+                                     self.mutation_factor, self.crossover_rate, self.generations)
+
+    def run(self, island_ids=None):
+        """
+        Run the islands and return the best (params, profit) found, with params in the DE layout.
+
+        Parameters:
+        - island_ids (list of int): The islands to run in this process tree. Defaults to all of them.
+          To spread islands over several nodes, run the same model on every node with a
+          SocketTransport and pass each node its own share of the ids.
+        """
+        if island_ids is None:
+            island_ids = list(range(self.num_islands))
+        if self.seed is None:
+            seeds = {i: np.random.randint(2**31 - 1) for i in island_ids}
+        else:
+            seeds = {i: self.seed + i for i in island_ids}
+
+        self.transport.setup(self.topology)
+        results = mp.Queue()
+        processes = [
+            mp.Process(target=run_island,
+                       args=(i, self.build_optimizer(i), self.topology, self.transport,
+                             self.generations, self.migration_interval, self.migration_size,
+                             self.target_profit, seeds[i], results))
+            for i in island_ids
+        ]
+        for process in processes:
+            process.start()
+        self.transport.release()
+        # Drain the queue before joining so that no island blocks on a full queue
+        collected = []
+        while len(collected) < len(processes):
+            try:
+                collected.append(results.get(timeout=1.))
+            except queue.Empty:
+                failed = [p for p in processes if p.exitcode not in (None, 0)]
+                if failed:
+                    for process in processes:
+                        process.terminate()
+                    raise RuntimeError(f"{len(failed)} island(s) exited with an error")
+        for process in processes:
+            process.join()
+
+        self.island_results = sorted(collected, key=lambda result: result["island"])
+        best = max(self.island_results, key=lambda result: result["best_profit"])
+        return best["best_params"], best["best_profit"]
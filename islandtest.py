@@ -0,0 +1,48 @@
+from bossodata import simulator, simulation_params, bounds
+from island import IslandModel, PipeTransport, SocketTransport
+
+if __name__ == "__main__":
+    # Three DE islands and one PSO island on a ring, exchanging their best vector every 5 generations
+    model = IslandModel(
+        simulator=simulator,
+        bounds=bounds,
+        num_islands=4,
+        num_pso_islands=1,
+        simulation_params=simulation_params,
+        generations=20,
+        population_size=10,
+        migration_interval=5,
+        migration_size=1,
+        topology="ring",
+        transport=PipeTransport(),
+        seed=0,
+    )
+    best_params, best_profit = model.run()
+    print("Best parameters:", best_params)
+    print("Best profit:", best_profit)
+    for result in model.island_results:
+        print(result)
+    assert [result["island"] for result in model.island_results] == [0, 1, 2, 3]
+    assert all(result["generations"] == 20 for result in model.island_results)
+    assert best_profit == max(result["best_profit"] for result in model.island_results)
+
+    # Same search over TCP sockets, stopping as soon as any island reaches the target
+    model.transport = SocketTransport(base_port=6100)
+    model.target_profit = best_profit
+    best_params, best_profit = model.run()
+    print("Best parameters:", best_params)
+    print("Best profit:", best_profit)
+    for result in model.island_results:
+        print(f"Island {result['island']} ({result['optimizer']}): {result['generations']} generations in {result['elapsed']} seconds")
+    # Every island finishes, whether it reached the target, was stopped or ran all its generations
+    assert len(model.island_results) == 4
+    assert all(result["generations"] <= 20 for result in model.island_results)
+    if any(result["target_reached"] for result in model.island_results):
+        assert best_profit >= model.target_profit
+
+    # A finished island must not block its neighbours: here the PSO island finishes long before the DE one
+    model = IslandModel(simulator=simulator, bounds=bounds, num_islands=2, num_pso_islands=1,
+                        simulation_params=simulation_params, generations=600, population_size=4,
+                        migration_interval=1, transport=PipeTransport(), seed=0)
+    model.run()
+    assert all(result["generations"] == 600 for result in model.island_results)
@@ -1,9 +1,10 @@
 import numpy as np
-import pandas as pd
 from simulation import RestaurantSimulator 
+from chain import RestaurantChain
+from polish import IntegerLocalSearch
 
 class PSOOptimizer:
-    def __init__(self, simulation_params, simulator, swarm_size=20, max_iter=100):
+    def __init__(self, simulation_params, simulator, swarm_size=20, max_iter=100, bounds=None):
         """
         Initialize the PSO optimizer.
 
@@ -11,32 +12,37 @@ class PSOOptimizer:
         - simulation_params (dict): Parameters to initialize the RestaurantSimulator.
         - swarm_size (int): Number of particles in the swarm.
         - max_iter (int): Maximum number of iterations.
+        - bounds (list of tuples): (lower_bound, upper_bound) for each dimension. Defaults to
+          (1, 10) servers, (1, 10) cooks and (0, 1000) of every dish in simulation_params['inventory_df'].
         """
         self.simulator = simulator
         self.simulation_params = simulation_params
         self.swarm_size = swarm_size
         self.max_iter = max_iter
-        self.dimension = 2 + len(simulation_params['inventory_df'])  # num_servers, num_cooks, inventory quantities
-        self.bounds = {
-            "num_servers": (1, 10), 
-            "num_cooks": (1, 10),
-            "inventory": (0, 1000) 
-        }
+        if bounds is None:
+            bounds = [
+                (1, 10),  # num_servers
+                (1, 10),  # num_cooks
+                *[(0, 1000)] * len(simulation_params['inventory_df'])  # inventory quantities
+            ]
+        self.bounds = bounds
+        self.dimension = len(bounds)
         self.global_best_position = None
         self.global_best_value = float('-inf')
+        self.personal_best_values = None
     
     def initialize_particles(self):
         """
         Initialize the particles with random positions and velocities.
         """
+        # Make sure shape matches particle[i]
+        self.lower_bounds = np.array([low for low, _ in self.bounds])
+        self.upper_bounds = np.array([high for _, high in self.bounds])
+
         particles = []
         velocities = []
         for _ in range(self.swarm_size):
-            position = np.array([
-                np.random.randint(self.bounds['num_servers'][0], self.bounds['num_servers'][1] + 1),
-                np.random.randint(self.bounds['num_cooks'][0], self.bounds['num_cooks'][1] + 1),
-                *np.random.randint(self.bounds['inventory'][0], self.bounds['inventory'][1] + 1, len(self.simulation_params['inventory_df']))
-            ])
+            position = np.array([np.random.randint(low, high + 1) for low, high in self.bounds])
             velocity = np.random.uniform(-1, 1, self.dimension)
             particles.append(position)
             velocities.append(velocity)
@@ -52,65 +58,155 @@ class PSOOptimizer:
         Returns:
         - profit (float): The profit calculated by the simulator.
         """
+        if hasattr(self.simulator, "evaluate"):
+            # Chains lay out and evaluate their own parameter vectors
+            return self.simulator.evaluate(position, num_runs)
         num_servers = int(position[0])
         num_cooks = int(position[1])
         inventory_list = position[2:]
         self.simulator.num_servers = num_servers
         self.simulator.num_cooks = num_cooks
-        self.simulator.init_inventory_df['Quantity'] = inventory_list
+        self.simulator.set_inventory(inventory_list)
         profit = []
         for _ in range(num_runs):
             self.simulator.run_simulation()
             profit.append(self.simulator.calculate_profit())
         return np.mean(profit)
         
-    def optimize(self):
+    def evaluate_particles(self, positions, num_runs=1):
         """
-        Perform PSO optimization.
+        Return the fitness of every position.
         """
-        particles, velocities = self.initialize_particles()
-        personal_best_positions = particles.copy()
-        personal_best_values = np.array([self.evaluate_particle(p) for p in particles])
-        self.global_best_position = personal_best_positions[np.argmax(personal_best_values)]
-        self.global_best_value = np.max(personal_best_values)
-        
-        w = 0.5  # Inertia weight
-        c1, c2 = 1.5, 1.5  # Coefs
+        if hasattr(self.simulator, "evaluate_batch"):
+            # Hand a chain the whole batch so its pool gets every (vector, location) pair at once
+            return [result["profit"] for result in self.simulator.evaluate_batch(positions, num_runs)]
+        return [self.evaluate_particle(position, num_runs) for position in positions]
 
-        # Make sure shape matches particle[i]
-        lower_bounds = np.array([
-            self.bounds["num_servers"][0],
-            self.bounds["num_cooks"][0],
-            *[self.bounds["inventory"][0]] * (self.dimension - 2)
-        ])
-        upper_bounds = np.array([
-            self.bounds["num_servers"][1],
-            self.bounds["num_cooks"][1],
-            *[self.bounds["inventory"][1]] * (self.dimension - 2)
-        ])
+    def initialize(self):
+        """
+        Initialize the swarm and evaluate the starting positions.
+        """
+        self.personal_best_values = None
+        self.global_best_position = None
+        self.global_best_value = float('-inf')
+        self.tell(self.evaluate_particles(self.ask()))
+
+    def step(self, w=0.5, c1=1.5, c2=1.5):
+        """
+        Move every particle once and update the personal and global bests.
+        Each particle is evaluated as soon as it moves, so later particles follow a global best
+        it improved. A chain instead gets the whole iteration as one batch through ask() and tell().
+
+        Parameters:
+        - w (float): Inertia weight.
+        - c1, c2 (float): Cognitive and social coefficients.
+        """
+        if hasattr(self.simulator, "evaluate_batch"):
+            self.tell(self.evaluate_particles(self.ask(w, c1, c2)))
+            return
+        for i in range(self.swarm_size):
+            self.move(i, w, c1, c2)
+            # Evaluate fitness
+            self.update(i, self.evaluate_particle(self.particles[i]))
+
+    def move(self, i, w, c1, c2):
+        """
+        Update the velocity and position of particle i.
+        """
+        particles = self.particles
+        velocities = self.velocities
+        r1, r2 = np.random.rand(), np.random.rand()
+        cognitive_component = c1 * r1 * (self.personal_best_positions[i] - particles[i])
+        social_component = c2 * r2 * (self.global_best_position - particles[i])
+        velocities[i] = w * velocities[i] + cognitive_component + social_component
+        particles[i] = np.clip(particles[i] + velocities[i], self.lower_bounds, self.upper_bounds)  # Update positions
+
+        # Make sure integers because discrete variables
+        particles[i][:2] = np.rint(particles[i][:2])  # num_servers, num_cooks
+        particles[i][2:] = np.rint(particles[i][2:])  # inventory quantities
+
+    def update(self, i, fitness):
+        """
+        Update the personal best of particle i and the global best with its fitness.
+        """
+        if fitness > self.personal_best_values[i]:
+            self.personal_best_values[i] = fitness
+            self.personal_best_positions[i] = self.particles[i]
 
+        if fitness > self.global_best_value:
+            self.global_best_value = fitness
+            self.global_best_position = self.particles[i].copy()
+
+    def ask(self, w=0.5, c1=1.5, c2=1.5):
+        """
+        Return the positions to evaluate next, for drivers that evaluate a whole iteration at once.
+        The first call returns the initial swarm; later calls move every particle using the bests
+        known at the start of the iteration. Pass the profits back to tell() in the same order.
+        """
+        if self.personal_best_values is None:
+            self.particles, self.velocities = self.initialize_particles()
+            return self.particles.copy()
+
+        for i in range(self.swarm_size):
+            self.move(i, w, c1, c2)
+        return self.particles.copy()
+
+    def tell(self, profits):
+        """
+        Update the personal and global bests with the profits of the positions from ask().
+        """
+        profits = np.asarray(profits, dtype=float)
+        if self.personal_best_values is None:
+            self.personal_best_positions = self.particles.copy()
+            self.personal_best_values = np.full(self.swarm_size, -np.inf)
+        for i in range(self.swarm_size):
+            self.update(i, profits[i])
+
+    def emigrants(self, count):
+        """
+        Return copies of the `count` best personal-best positions and their profits.
+        """
+        order = np.argsort(self.personal_best_values)[::-1][:count]
+        return self.personal_best_positions[order].copy(), self.personal_best_values[order].copy()
+
+    def accept_immigrants(self, positions, profits):
+        """
+        Move the particles with the worst personal bests onto incoming positions.
+        """
+        worst = np.argsort(self.personal_best_values)[:len(positions)]
+        for i, position, profit in zip(worst, positions, profits):
+            position = np.clip(position, self.lower_bounds, self.upper_bounds)
+            self.particles[i] = position
+            self.personal_best_positions[i] = position
+            self.personal_best_values[i] = profit
+            if profit > self.global_best_value:
+                self.global_best_value = profit
+                self.global_best_position = self.particles[i].copy()
+
+    def optimize(self):
+        """
+        Perform PSO optimization.
+        """
+        self.initialize()
         for j in range(self.max_iter):
             print("iteration ", j)
-            for i in range(self.swarm_size):
-                r1, r2 = np.random.rand(), np.random.rand()
-                cognitive_component = c1 * r1 * (personal_best_positions[i] - particles[i])
-                social_component = c2 * r2 * (self.global_best_position - particles[i])
-                velocities[i] = w * velocities[i] + cognitive_component + social_component
-                particles[i] = np.clip(particles[i] + velocities[i], lower_bounds, upper_bounds)  # Update positions
-
-                # Make sure integers because discrete variables
-                particles[i][:2] = np.rint(particles[i][:2])  # num_servers, num_cooks
-                particles[i][2:] = np.rint(particles[i][2:])  # inventory quantities
-
-                # Evaluate fitness
-                fitness = self.evaluate_particle(particles[i])
-                if fitness > personal_best_values[i]:
-                    personal_best_values[i] = fitness
-                    personal_best_positions[i] = particles[i]
-
-                if fitness > self.global_best_value:
-                    self.global_best_value = fitness
-                    self.global_best_position = particles[i]
-                    print(fitness, particles[i])
+            previous_best = self.global_best_value
+            self.step()
+            if self.global_best_value > previous_best:
+                print(self.global_best_value, self.global_best_position)
+
+        return self.global_best_position, self.global_best_value
 
+    def polish(self, **kwargs):
+        """
+        Refine global_best_position with an integer local search around it. global_best_value becomes
+        the search's re-evaluated profit of the result. Keyword arguments are passed to IntegerLocalSearch.
+        """
+        order = np.arange(self.dimension)
+        if not isinstance(self.simulator, RestaurantChain):
+            # The local search uses the DE layout, with cooks before servers
+            order[[0, 1]] = [1, 0]
+        search = IntegerLocalSearch(self.simulator, [self.bounds[d] for d in order], **kwargs)
+        params, self.global_best_value = search.polish(np.asarray(self.global_best_position)[order])
+        self.global_best_position = params[order]
         return self.global_best_position, self.global_best_value
@@ -0,0 +1,134 @@
+import numpy as np
+from chain import RestaurantChain
+
+
+class IntegerLocalSearch:
+    def __init__(self, simulator, bounds, inventory_step=10, mode="best", budget=2000,
+                 num_runs=5, batch_size=None, processes=None, min_improvement=0.0):
+        """
+        Polish an optimizer's answer by searching its integer neighbourhood.
+
+        Neighbours change one dimension at a time: ±1 cook or server, or ±inventory_step units
+        of one dish (or of one central kitchen transfer for a chain). Each round evaluates the
+        current point and its neighbours in parallel batches that share the same random seeds,
+        so they are compared under common random numbers.
+
+        Parameters:
+        - simulator (RestaurantSimulator or RestaurantChain): What to evaluate. Vectors use the DE layout
+          (num_cooks, num_servers, inventory...) for a single simulator and the chain layout for a chain.
+        - bounds (list of tuples): (lower_bound, upper_bound) for each parameter.
+        - inventory_step (int): How many units an inventory or transfer move adds or removes.
+        - mode (str): "best" moves to the best neighbour of a round, "first" to the first improving batch.
+        - budget (int): Maximum number of simulations, counted as configurations times num_runs.
+        - num_runs (int): Simulations per configuration, averaged.
+        - batch_size (int): Configurations per parallel batch. Defaults to every neighbour in "best" mode
+          and to one per worker process in "first" mode.
+        - processes (int): Worker processes used for a single simulator. Ignored for a chain, which has its own pool.
+        - min_improvement (float): How much better a neighbour must be to be accepted.
+        """
+        if mode not in ("best", "first"):
+            raise ValueError(f"mode must be 'best' or 'first', got {mode!r}")
+        if budget < num_runs:
+            raise ValueError(f"budget ({budget}) must allow at least one configuration of num_runs ({num_runs}) simulations")
+        self.simulator = simulator
+        self.bounds = bounds
+        self.inventory_step = inventory_step
+        self.mode = mode
+        self.budget = budget
+        self.num_runs = num_runs
+        self.batch_size = batch_size
+        self.processes = processes
+        self.min_improvement = min_improvement
+
+        self.lower_bounds = np.array([max(low, 0) for low, _ in bounds])
+        self.upper_bounds = np.array([high for _, high in bounds])
+        if isinstance(simulator, RestaurantChain):
+            kinds = simulator.param_kinds()
+        else:
+            kinds = ['staff', 'staff'] + ['inventory'] * (len(bounds) - 2)
+        self.steps = np.array([1 if kind == 'staff' else inventory_step for kind in kinds])
+
+        self.simulations = 0
+        self.history = []
+
+    def neighbours(self, params):
+        """
+        Return every distinct in-bounds point one move away from params.
+        """
+        neighbours = []
+        for d, step in enumerate(self.steps):
+            values = set()
+            for delta in (step, -step):
+                value = np.clip(params[d] + delta, self.lower_bounds[d], self.upper_bounds[d])
+                if value != params[d] and value not in values:
+                    values.add(value)
+                    neighbour = params.copy()
+                    neighbour[d] = value
+                    neighbours.append(neighbour)
+        return neighbours
+
+    def polish(self, params):
+        """
+        Climb from params until no neighbour improves or the budget runs out.
+        A starting point outside the bounds (DE only clamps at 0) is first clipped into them.
+
+        Every round starts by re-evaluating the incumbent, and enough budget is held back for
+        that, so the returned profit is never the maximum of a round's noisy estimates.
+
+        Returns:
+        - params (array): The polished parameter vector.
+        - profit (float): Its mean profit over num_runs simulations, re-evaluated at the start
+          of the last round with that round's seed.
+        """
+        if isinstance(self.simulator, RestaurantChain):
+            evaluator = self.simulator
+        else:
+            evaluator = RestaurantChain([self.simulator], processes=self.processes)
+        batch_size = self.batch_size
+        if batch_size is None:
+            batch_size = None if self.mode == "best" else max(evaluator.processes, 1)
+
+        incumbent = np.clip(np.array(params, dtype=np.int64), self.lower_bounds, self.upper_bounds)
+        self.simulations = 0
+        self.history = []
+        try:
+            improved = True
+            while improved:
+                improved = False
+                # A fresh seed per round, shared by the incumbent and all of its neighbours
+                seed = np.random.randint(2**31 - 1)
+                neighbours = self.neighbours(incumbent)
+                if self.mode == "first":
+                    np.random.shuffle(neighbours)
+                # Always run one batch, so the incumbent is evaluated even without neighbours
+                size = batch_size or max(len(neighbours), 1)
+
+                reference = None
+                best, best_profit = None, None
+                for start in range(0, max(len(neighbours), 1), size):
+                    affordable = (self.budget - self.simulations) // self.num_runs
+                    # Keep one configuration in reserve to re-evaluate the next incumbent
+                    spare = affordable - 1 - (reference is None)
+                    batch = neighbours[start:start + min(size, max(spare, 0))]
+                    configs = batch if reference is not None else [incumbent] + batch
+                    if not configs:
+                        break
+                    results = evaluator.evaluate_batch(configs, self.num_runs, seed)
+                    self.simulations += len(configs) * self.num_runs
+                    profits = [result["profit"] for result in results]
+                    if reference is None:
+                        reference = profits.pop(0)
+                        configs = configs[1:]
+                    if profits and (best_profit is None or max(profits) > best_profit):
+                        best, best_profit = configs[int(np.argmax(profits))], max(profits)
+                    if self.mode == "first" and best_profit is not None and best_profit > reference + self.min_improvement:
+                        break
+
+                if best_profit is not None and best_profit > reference + self.min_improvement:
+                    incumbent = best
+                    improved = True
+                    self.history.append((incumbent.copy(), best_profit))
+        finally:
+            if evaluator is not self.simulator:
+                evaluator.close()
+        return incumbent, reference
@@ -0,0 +1,45 @@
+import numpy as np
+from bossodata import simulator, bounds
+from diffev import DifferentialEvolution
+from polish import IntegerLocalSearch
+
+if __name__ == "__main__":
+    # Neighbours stay in bounds and are distinct, even from a point outside the bounds
+    search = IntegerLocalSearch(simulator, bounds, inventory_step=10)
+    lower, upper = np.array([low for low, _ in bounds]), np.array([high for _, high in bounds])
+    for point in ([1, 6, 10, 500, 250, 255], [3, 3, 495, 15, 250, 250], [9, 0, 903, 0, 250, 250]):
+        point = np.clip(point, lower, upper)
+        neighbours = search.neighbours(point)
+        assert all(np.all(neighbour >= lower) and np.all(neighbour <= upper) for neighbour in neighbours)
+        assert len({tuple(neighbour) for neighbour in neighbours}) == len(neighbours)
+        assert not any(np.array_equal(neighbour, point) for neighbour in neighbours)
+    assert len(search.neighbours(np.array([3, 3, 250, 250, 250, 250]))) == 12
+
+    optimizer = DifferentialEvolution(
+        simulator=simulator,
+        bounds=bounds,
+        population_size=20,
+        mutation_factor=0.8,
+        crossover_rate=0.5,
+        generations=20,
+    )
+    optimizer.optimize()
+    print("DE best parameters:", optimizer.best_params)
+    print("DE best profit:", optimizer.best_profit)
+    de_params = optimizer.best_params.copy()
+
+    # Best-improvement search: every neighbour is evaluated each round, in one parallel batch
+    search = IntegerLocalSearch(simulator, bounds, inventory_step=10, mode="best", budget=1000, num_runs=5)
+    best_params, best_profit = search.polish(de_params)
+    print(f"Best improvement: {best_params} with profit {best_profit} after {search.simulations} simulations")
+    assert search.simulations <= 1000
+    assert np.all(best_params >= lower) and np.all(best_params <= upper)
+
+    # First-improvement search: neighbours are evaluated in small batches and the first gain is taken
+    search = IntegerLocalSearch(simulator, bounds, inventory_step=10, mode="first", budget=1000, num_runs=5, batch_size=4)
+    first_params, first_profit = search.polish(de_params)
+    print(f"First improvement: {first_params} with profit {first_profit} after {search.simulations} simulations")
+
+    # Same polishing through the optimizer
+    num_cooks, num_servers, inventory_list = optimizer.polish(budget=1000, num_runs=5)
+    print(f"Polished: {num_cooks} cooks, {num_servers} servers, inventory {inventory_list}, profit {optimizer.best_profit}")
@@ -0,0 +1,314 @@
+import numpy as np
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from chain import RestaurantChain
+from diffev import DifferentialEvolution
+from particleswarm import PSOOptimizer
+
+# Events after which a job publishes nothing more
+FINAL_EVENTS = ("done", "cancelled", "failed")
+
+
+def evaluate_params(simulator, param_list, num_runs, seed, layout):
+    """
+    Return the mean profit of every parameter vector. Runs in a worker process.
+
+    Parameters:
+    - layout (str): "de" for (num_cooks, num_servers, inventory...) or "pso" for
+      (num_servers, num_cooks, inventory...). Chains always use their own layout.
+    """
+    np.random.seed(seed)
+    if isinstance(simulator, RestaurantChain):
+        # Already inside a worker, so simulate the locations here rather than in a nested pool
+        simulator.processes = 1
+        return [simulator.evaluate(params, num_runs) for params in param_list]
+
+    profits = []
+    for params in param_list:
+        if layout == "pso":
+            num_servers, num_cooks = params[0], params[1]
+        else:
+            num_cooks, num_servers = params[0], params[1]
+        simulator.num_cooks = int(num_cooks)
+        simulator.num_servers = int(num_servers)
+        simulator.set_inventory(params[2:])
+        runs = []
+        for _ in range(num_runs):
+            simulator.run_simulation()
+            runs.append(simulator.calculate_profit())
+        profits.append(np.mean(runs))
+    return profits
+
+
+class Job:
+    """
+    An optimization job running inside an OptimizationService.
+    """
+    def __init__(self, job_id, kind, simulator, num_runs, layout):
+        self.id = job_id
+        self.kind = kind
+        self.simulator = simulator
+        self.num_runs = num_runs
+        self.layout = layout
+        self.status = "queued"
+        self.result = None
+        self.evaluations = 0
+        self.start_time = None
+        self.task = None
+        self.subscribers = []
+        self.event_history = []
+
+    def subscribe(self):
+        """
+        Return an asyncio.Queue that receives every event the job has published so far,
+        followed by every event it publishes from now on.
+        """
+        queue = asyncio.Queue()
+        for event in self.event_history:
+            queue.put_nowait(event)
+        self.subscribers.append(queue)
+        return queue
+
+    async def events(self):
+        """
+        Iterate over the job's events, from the first one, until it is done, cancelled or failed.
+        """
+        queue = self.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["type"] in FINAL_EVENTS:
+                    return
+        finally:
+            self.subscribers.remove(queue)
+
+    def publish(self, event_type, **data):
+        event = {"job": self.id, "kind": self.kind, "type": event_type, **data}
+        self.event_history.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def cancel(self):
+        """
+        Stop the job. Simulations already running finish, but their results are dropped.
+        """
+        if self.task is not None:
+            self.task.cancel()
+
+    async def wait(self):
+        """
+        Wait for the job and return its result. Raises CancelledError if it was cancelled.
+        """
+        return await self.task
+
+
+class OptimizationService:
+    def __init__(self, max_workers=None, chunk_size=4):
+        """
+        Run many DE, PSO and sweep jobs concurrently on one shared process pool.
+
+        Each job breaks its simulations into tasks of `chunk_size` parameter vectors. At most
+        `max_workers` tasks run at once, and free workers are handed out to jobs in turn, so a
+        large job cannot starve the others and the machine is never oversubscribed.
+
+        Parameters:
+        - max_workers (int): Worker processes in the pool. Defaults to the number of cores.
+        - chunk_size (int): Parameter vectors per task sent to a worker.
+        """
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.chunk_size = chunk_size
+        self.executor = None
+        self.dispatcher = None
+        self.jobs = {}
+        self.job_ids = itertools.count(1)
+
+        # Job id -> deque of (task arguments, future), and the round-robin order of jobs with queued tasks
+        self.pending = {}
+        self.ready = deque()
+        self.slots = None
+        self.wakeup = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        self.executor = ProcessPoolExecutor(self.max_workers)
+        self.slots = asyncio.Semaphore(self.max_workers)
+        self.wakeup = asyncio.Event()
+        self.dispatcher = asyncio.create_task(self.dispatch())
+
+    async def stop(self):
+        """
+        Cancel every unfinished job and shut down the pool.
+        """
+        for job in self.jobs.values():
+            job.cancel()
+        await asyncio.gather(*(job.task for job in self.jobs.values()), return_exceptions=True)
+        self.dispatcher.cancel()
+        await asyncio.gather(self.dispatcher, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+        self.executor = None
+
+    async def dispatch(self):
+        """
+        Hand each free worker to the next job in turn that has a task queued.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            task = None
+            while task is None:
+                while not self.ready:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                job_id = self.ready.popleft()
+                queue = self.pending.get(job_id)
+                if not queue:
+                    continue
+                args, future = queue.popleft()
+                if queue:
+                    self.ready.append(job_id)
+                else:
+                    del self.pending[job_id]
+                if not future.cancelled():
+                    task = (args, future)
+
+            args, future = task
+            running = loop.run_in_executor(self.executor, evaluate_params, *args)
+            running.add_done_callback(lambda done, future=future: self.finish_task(done, future))
+
+    def finish_task(self, done, future):
+        self.slots.release()
+        if future.cancelled():
+            return
+        if done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+
+    async def evaluate(self, job, param_list):
+        """
+        Queue the simulations of one batch of parameter vectors and wait for their profits.
+        """
+        loop = asyncio.get_running_loop()
+        param_list = [np.asarray(params) for params in param_list]
+        futures = []
+        queue = self.pending.setdefault(job.id, deque())
+        for start in range(0, len(param_list), self.chunk_size):
+            chunk = param_list[start:start + self.chunk_size]
+            future = loop.create_future()
+            seed = np.random.randint(2**31 - 1)
+            queue.append(((job.simulator, chunk, job.num_runs, seed, job.layout), future))
+            futures.append(future)
+        if job.id not in self.ready:
+            self.ready.append(job.id)
+        self.wakeup.set()
+
+        profits = []
+        for chunk_profits in await asyncio.gather(*futures):
+            profits.extend(chunk_profits)
+        job.evaluations += len(param_list) * job.num_runs
+        return profits
+
+    def publish_progress(self, job, step, best_profit, best_params):
+        elapsed = time.time() - job.start_time
+        job.publish("progress", step=step, best_profit=best_profit, best_params=best_params,
+                    evaluations=job.evaluations,
+                    evaluations_per_sec=job.evaluations / elapsed if elapsed > 0 else 0.)
+
+    def launch(self, kind, simulator, num_runs, layout, run):
+        job = Job(next(self.job_ids), kind, simulator, num_runs, layout)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self.run_job(job, run))
+        return job
+
+    async def run_job(self, job, run):
+        job.status = "running"
+        job.start_time = time.time()
+        job.publish("started")
+        try:
+            job.result = await run(job)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.publish("cancelled")
+            raise
+        except Exception as error:
+            job.status = "failed"
+            job.publish("failed", error=repr(error))
+            raise
+        finally:
+            # Drop simulations that have not been handed to a worker yet
+            self.pending.pop(job.id, None)
+        job.status = "done"
+        job.publish("done", result=job.result, evaluations=job.evaluations,
+                    elapsed=time.time() - job.start_time)
+        return job.result
+
+    def submit_de(self, simulator, bounds, population_size, mutation_factor, crossover_rate,
+                  generations, num_runs=1):
+        """
+        Start a Differential Evolution job. Each generation's targets and trials are simulated as one batch.
+        Returns the Job; its result is a dict with 'best_params' and 'best_profit'.
+        """
+        optimizer = DifferentialEvolution(simulator, bounds, population_size,
+                                          mutation_factor, crossover_rate, generations)
+
+        async def run(job):
+            optimizer.initialize()
+            for g in range(generations):
+                optimizer.tell(await self.evaluate(job, optimizer.ask()))
+                self.publish_progress(job, g, optimizer.best_profit, optimizer.best_params)
+            return {"best_params": optimizer.best_params, "best_profit": optimizer.best_profit}
+
+        return self.launch("de", simulator, num_runs, "de", run)
+
+    def submit_pso(self, simulation_params, simulator, swarm_size=20, max_iter=100, bounds=None, num_runs=1):
+        """
+        Start a Particle Swarm job. Each iteration's particles are simulated as one batch.
+        Returns the Job; its result is a dict with 'best_params' and 'best_profit'.
+        """
+        optimizer = PSOOptimizer(simulation_params, simulator, swarm_size, max_iter, bounds)
+
+        async def run(job):
+            # The first round evaluates the initial swarm
+            for j in range(max_iter + 1):
+                optimizer.tell(await self.evaluate(job, optimizer.ask()))
+                self.publish_progress(job, j, optimizer.global_best_value, optimizer.global_best_position)
+            return {"best_params": optimizer.global_best_position, "best_profit": optimizer.global_best_value}
+
+        return self.launch("pso", simulator, num_runs, "pso", run)
+
+    def submit_sweep(self, simulator, param_list, num_runs=1, batch_size=None):
+        """
+        Start a job that evaluates every parameter vector in param_list (DE layout for a single simulator).
+        Returns the Job; its result is a dict with 'profits', 'best_params' and 'best_profit'.
+
+        Parameters:
+        - batch_size (int): Vectors per progress update. Defaults to enough to fill the pool once.
+        """
+        param_list = [np.asarray(params) for params in param_list]
+        batch_size = batch_size if batch_size is not None else self.max_workers * self.chunk_size
+
+        async def run(job):
+            profits = []
+            best_profit, best_params = -float('inf'), None
+            for start in range(0, len(param_list), batch_size):
+                batch = param_list[start:start + batch_size]
+                batch_profits = await self.evaluate(job, batch)
+                profits.extend(batch_profits)
+                best = int(np.argmax(batch_profits))
+                if batch_profits[best] > best_profit:
+                    best_profit, best_params = batch_profits[best], batch[best]
+                self.publish_progress(job, start // batch_size, best_profit, best_params)
+            return {"profits": profits, "best_params": best_params, "best_profit": best_profit}
+
+        return self.launch("sweep", simulator, num_runs, "de", run)
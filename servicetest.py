@@ -0,0 +1,48 @@
+import asyncio
+from bossodata import simulator, simulation_params, bounds
+from service import OptimizationService
+
+async def watch(job):
+    async for event in job.events():
+        if event['type'] == 'progress':
+            print(f"Job {event['job']} ({event['kind']}) step {event['step']}: best profit {event['best_profit']}, "
+                  f"{event['evaluations_per_sec']:.1f} evaluations/sec")
+        else:
+            print(f"Job {event['job']} ({event['kind']}) {event['type']}")
+
+async def main():
+    async with OptimizationService(max_workers=4, chunk_size=4) as service:
+        de_job = service.submit_de(simulator, bounds, population_size=20, mutation_factor=0.8,
+                                   crossover_rate=0.5, generations=10)
+        pso_job = service.submit_pso(simulation_params, simulator, swarm_size=20, max_iter=10)
+        staffing = [[cooks, servers, 480, 0, 0, 440] for cooks in range(1, 7) for servers in range(1, 7)]
+        sweep_job = service.submit_sweep(simulator, staffing, num_runs=3)
+        # A long job that a manager gives up on
+        long_job = service.submit_de(simulator, bounds, population_size=30, mutation_factor=0.8,
+                                     crossover_rate=0.5, generations=75)
+        watchers = [asyncio.create_task(watch(job)) for job in (de_job, pso_job, sweep_job, long_job)]
+
+        await asyncio.sleep(5)
+        queued = len(service.pending.get(long_job.id, ()))
+        long_job.cancel()
+        try:
+            await long_job.wait()
+        except asyncio.CancelledError:
+            pass
+        # Its queued tasks are dropped, so it does no more simulations while the other jobs finish
+        print(f"Job {long_job.id} ({long_job.kind}) cancelled with {queued} tasks queued")
+        assert long_job.status == "cancelled"
+        assert long_job.id not in service.pending
+        evaluations = long_job.evaluations
+
+        for job in (de_job, pso_job, sweep_job):
+            result = await job.wait()
+            print(f"Job {job.id} ({job.kind}): best parameters {result['best_params']}, best profit {result['best_profit']}")
+        await asyncio.gather(*watchers)
+        print(f"Job {long_job.id} ({long_job.kind}): {long_job.status}")
+        assert long_job.evaluations == evaluations
+        assert all(job.event_history[0]["type"] == "started" for job in (de_job, pso_job, sweep_job, long_job))
+        assert long_job.event_history[-1]["type"] == "cancelled"
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,32 @@
 import numpy as np
-import pandas as pd
 import heapq
 
+# pandas is only imported when a DataFrame is requested, so that worker processes
+# running the event loop never pay for it.
+ORDER_LOG_COLUMNS = ['CustomerID', 'ArrivalTime', 'Dish', 'WaitTime', 'ConsumptionTime', 'Revenue', 'Cost', 'DepartureTime']
+
+# Columns of the numeric order log
+ARRIVAL, WAIT, CONSUMPTION, REVENUE, COST, DEPARTURE = range(6)
+
+
+def column(table, name):
+    """
+    Read a column from a DataFrame or a dict of sequences as a NumPy array.
+    """
+    return np.asarray(table[name])
+
+
+READ_ONLY_INVENTORY = "Inventory DataFrames are copies; use RestaurantSimulator.set_inventory() to change the inventory"
+
+
+def inventory_frame(dishes, quantities):
+    """
+    Build a ['Dish', 'Quantity'] DataFrame from the inventory arrays.
+    """
+    import pandas as pd
+    return pd.DataFrame({'Dish': dishes, 'Quantity': quantities})
+
+
 class RestaurantSimulator:
     def __init__(self, duration, arrival_rates, 
                  menu_df, seating_capacity, num_cooks, 
@@ -12,15 +37,22 @@ class RestaurantSimulator:
         Initialize the restaurant simulator with key parameters.
 
         Parameters:
-        - menu_df (DataFrame): DataFrame containing dishes with columns ['Dish', 'Cost', 'SalePrice', 'PrepTime', 'DemandRating'].
+        - menu_df (DataFrame or dict): Dishes with columns ['Dish', 'Cost', 'SalePrice', 'PrepTime', 'DemandRating'].
         - Note Prep time takes into account all time from the point in which a customer is seated to the time in which they're food arrives
         - seating_capacity (int): Number of tables in the restaurant.
         - num_cooks (int): Number of cooks available.
         - num_servers (int): Number of servers available.
-        - inventory_df (DataFrame): DataFrame with columns ['Dish', 'Quantity'] for tracking inventory.
+        - inventory_df (DataFrame or dict): Columns ['Dish', 'Quantity'] for tracking inventory.
+
+        The tables are copied into NumPy arrays indexed by menu position; the DataFrames
+        are rebuilt on demand through the `menu_df`, `inventory_df` and `order_log` properties.
         """
-        inventory_df['Quantity'] = inventory_df['Quantity'].clip(lower=0)
-        self.menu_df = menu_df
+        self.dishes = column(menu_df, 'Dish')
+        self.dish_cost = column(menu_df, 'Cost').astype(float)
+        self.sale_price = column(menu_df, 'SalePrice').astype(float)
+        self.prep_time = column(menu_df, 'PrepTime').astype(float)
+        self.demand_rating = column(menu_df, 'DemandRating').astype(float)
+        self.demand_probabilities = self.demand_rating / self.demand_rating.sum()
         self.inventory_discount = inventory_discount
         self.seating_capacity = seating_capacity
         self.server_capacity = server_capacity
@@ -28,12 +60,12 @@ class RestaurantSimulator:
         self.cook_capacity = cook_capacity
         self.num_cooks = max(num_cooks, 0)
         self.num_servers = max(num_servers, 0)
-        self.init_inventory_df = inventory_df
+        self.init_inventory = self.align_inventory(inventory_df)
         self.duration = duration
         self.arrival_rates = arrival_rates if isinstance(arrival_rates, list) else [arrival_rates]
 
         # State variables
-        self.inventory_df = inventory_df.copy()
+        self.inventory = self.init_inventory.copy()
         self.available_tables = seating_capacity
         self.available_servers = self.server_capacity * self.num_servers
         self.available_cooks = self.cook_capacity * self.num_cooks
@@ -43,30 +75,111 @@ class RestaurantSimulator:
         self.server_wage = server_wage
         self.customer_dissatisfaction = 0
 
+        # Order log, one row per customer id, grown in run_simulation
+        self.log = np.full((0, 6), np.nan)
+        self.log_dish = np.full(0, -1, dtype=np.int64)
+        self.seated = np.zeros(0, dtype=bool)
+
         # queues
         self.event_queue = []
         self.server_queue = []
         self.cook_queue = []
+
+    def align_inventory(self, inventory_df):
+        """
+        Return the inventory quantities in menu order. Dishes missing from the inventory have none.
+        """
+        quantities = dict(zip(column(inventory_df, 'Dish'), column(inventory_df, 'Quantity')))
+        aligned = np.array([quantities.get(dish, 0) for dish in self.dishes], dtype=np.int64)
+        return np.maximum(aligned, 0)
+
+    def set_inventory(self, quantities):
+        """
+        Set the starting inventory from a sequence of quantities in menu order.
+        """
+        quantities = np.asarray(quantities)
+        if quantities.shape != self.init_inventory.shape:
+            raise ValueError(f"Expected {len(self.init_inventory)} inventory quantities, got {quantities.shape}")
+        np.maximum(quantities, 0, out=self.init_inventory, casting='unsafe')
+
+    @property
+    def menu_df(self):
+        import pandas as pd
+        return pd.DataFrame({'Dish': self.dishes, 'Cost': self.dish_cost, 'SalePrice': self.sale_price,
+                             'PrepTime': self.prep_time, 'DemandRating': self.demand_rating})
+
+    @property
+    def init_inventory_df(self):
+        """
+        Copy of the starting inventory. Changes made to the DataFrame never reach the simulator;
+        set_inventory() is the only way to change the inventory.
+        """
+        return inventory_frame(self.dishes, self.init_inventory)
+
+    @init_inventory_df.setter
+    def init_inventory_df(self, inventory_df):
+        raise AttributeError(READ_ONLY_INVENTORY)
+
+    @property
+    def inventory_df(self):
+        """
+        Copy of the current inventory. Like init_inventory_df, it cannot be used to change the inventory.
+        """
+        return inventory_frame(self.dishes, self.inventory)
+
+    @inventory_df.setter
+    def inventory_df(self, inventory_df):
+        raise AttributeError(READ_ONLY_INVENTORY)
+
+    @property
+    def order_log(self):
+        """
+        The order log of the last run as a DataFrame, one row per seated customer.
+        """
+        import pandas as pd
+        customer_ids = np.flatnonzero(self.seated[:self.customer_counter])
+        dish_index = self.log_dish[customer_ids]
+        dishes = np.where(dish_index >= 0, self.dishes[dish_index], None) if len(customer_ids) else []
+        log = self.log[customer_ids]
+        return pd.DataFrame({
+            'CustomerID': customer_ids + 1,
+            'ArrivalTime': log[:, ARRIVAL],
+            'Dish': pd.Series(dishes, dtype=object),
+            'WaitTime': log[:, WAIT],
+            'ConsumptionTime': log[:, CONSUMPTION],
+            'Revenue': log[:, REVENUE],
+            'Cost': log[:, COST],
+            'DepartureTime': log[:, DEPARTURE],
+        }, columns=ORDER_LOG_COLUMNS)
     
     def reset(self):
         # State variables
-        self.inventory_df = self.init_inventory_df.copy()
+        np.maximum(self.init_inventory, 0, out=self.inventory, casting='unsafe')
         self.num_cooks = max(self.num_cooks, 0)
         self.num_servers = max(self.num_servers, 0)
         self.available_tables = self.seating_capacity
         self.available_servers = self.server_capacity * self.num_servers
         self.available_cooks = self.cook_capacity * self.num_cooks
-        self.order_log = pd.DataFrame(columns=['CustomerID', 'ArrivalTime', 'Dish', 'WaitTime', 'ConsumptionTime', 'Revenue', 'Cost', 'DepartureTime'])
+        self.log.fill(np.nan)
+        self.log_dish.fill(-1)
+        self.seated.fill(False)
         self.customer_counter = 0 
         self.customer_dissatisfaction = 0
-        self.inventory_df['Quantity'] = self.inventory_df['Quantity'].clip(lower=0)
-    
 
         # queues
         self.event_queue = []
         self.server_queue = []
         self.cook_queue = []
 
+    def reserve_log(self, num_customers):
+        """
+        Make sure the order log has a row for every customer id up to num_customers.
+        """
+        if num_customers > len(self.log):
+            self.log = np.full((num_customers, 6), np.nan)
+            self.log_dish = np.full(num_customers, -1, dtype=np.int64)
+            self.seated = np.zeros(num_customers, dtype=bool)
+
     def schedule_event(self, time, event_type, customer_id=None):
         """
         Add an event to the priority queue.
@@ -105,7 +218,7 @@ class RestaurantSimulator:
             self.available_servers -= 1
             dish, isInventory = self.take_order(customer_id)
             if isInventory:
-                prep_time = np.random.exponential(self.menu_df.loc[self.menu_df['Dish'] == dish, 'PrepTime'].values[0])
+                prep_time = np.random.exponential(self.prep_time[dish])
                 if self.available_cooks > 0:
                     self.available_cooks -= 1
                     self.schedule_event(time + prep_time, 'meal_prep', customer_id)
@@ -119,30 +232,27 @@ class RestaurantSimulator:
     def handle_meal_prep(self, time, customer_id):
         # Update logs
         self.available_cooks += 1
-        arrival_time = self.order_log.loc[self.order_log['CustomerID'] == customer_id, 'ArrivalTime'].values[0]
-        self.order_log.loc[self.order_log['CustomerID'] == customer_id, 'WaitTime'] = time - arrival_time
+        row = self.log[customer_id - 1]
+        row[WAIT] = time - row[ARRIVAL]
         consumption_time = np.random.exponential(self.avg_consumption_time)
         self.schedule_event(time + consumption_time, 'departure', customer_id)
         
         if self.cook_queue and self.available_cooks > 0:
             self.available_cooks -= 1
             queued_time, queued_id = self.cook_queue.pop(0)
-            dish = self.order_log.loc[self.order_log["CustomerID"]==queued_id, "Dish"] .values[0]
-            prep_time = np.random.exponential(self.menu_df.loc[self.menu_df['Dish'] == dish, 'PrepTime'].values[0])
+            dish = self.log_dish[queued_id - 1]
+            prep_time = np.random.exponential(self.prep_time[dish])
             self.schedule_event(max(time, queued_time) + prep_time,"meal_prep", queued_id)
 
     def handle_departure(self, time, customer_id):
         self.available_tables += 1
         self.available_servers += 1
-        arrival_time = self.order_log.loc[self.order_log['CustomerID'] == customer_id, 'ArrivalTime'].values[0]
-        wait_time =  self.order_log.loc[self.order_log['CustomerID'] == customer_id, 'WaitTime'].values[0]
-        self.order_log.loc[self.order_log["CustomerID"]==customer_id, "ConsumptionTime"] = time - arrival_time - wait_time
-        self.order_log.loc[self.order_log["CustomerID"]==customer_id, "DepartureTime"] = time 
-        dish =self.order_log.loc[self.order_log["CustomerID"]==customer_id, "Dish"].iloc[0] 
-        sale_price = self.menu_df.loc[self.menu_df['Dish'] == dish, "SalePrice"].iloc[0]
-        self.order_log.loc[self.order_log["CustomerID"]==customer_id, "Revenue"] = sale_price
-        cost = self.menu_df.loc[self.menu_df['Dish'] == dish, "Cost"].iloc[0]
-        self.order_log.loc[self.order_log["CustomerID"]==customer_id, "Cost"] = cost
+        row = self.log[customer_id - 1]
+        dish = self.log_dish[customer_id - 1]
+        row[CONSUMPTION] = time - row[ARRIVAL] - row[WAIT]
+        row[DEPARTURE] = time
+        row[REVENUE] = self.sale_price[dish]
+        row[COST] = self.dish_cost[dish]
 
         if self.server_queue and self.available_servers > 0:
             queued_time, queued_id = self.server_queue.pop(0)
@@ -155,47 +265,32 @@ class RestaurantSimulator:
         return self.customer_counter
     
     def add_customer(self,time, customer_id):
-    # Add a new row with just the CustomerID, rest as None
-        new_row = pd.DataFrame([{'CustomerID': customer_id,  
-                   'ArrivalTime': time, 
-                   'Dish': None, 
-                   'WaitTime': None, 
-                   'ConsumptionTime': None, 
-                   'Revenue': None, 
-                   'Cost': None,
-                   'DepartureTime': None}])
-        self.order_log.loc[len(self.order_log)] = new_row.iloc[0]
+        # Start the customer's row with just the arrival time, rest as NaN
+        self.seated[customer_id - 1] = True
+        self.log[customer_id - 1, ARRIVAL] = time
 
 
     def take_order(self, customer_id):
         """
         Select a dish based on demand ranking and update the order log.
+        Returns the dish's menu index, or None if nothing is left in inventory.
         """
-        total_demand = self.menu_df['DemandRating'].sum()
-        probabilities = self.menu_df['DemandRating'] / total_demand
-        dish = np.random.choice(self.menu_df['Dish'], p=probabilities)    
-        
-        dish_inventory = self.inventory_df.loc[self.inventory_df['Dish'] == dish, 'Quantity'].values[0]
-        if dish_inventory > 0:
-            self.order_log.loc[self.order_log['CustomerID'] == customer_id, 'Dish'] = dish
-            self.manage_inventory(dish)
-            return dish, True
-        else:
-            self.customer_dissatisfaction += 1
-            available_dishes = self.inventory_df[self.inventory_df['Quantity'] > 0]
+        while True:
+            dish = np.random.choice(len(self.dishes), p=self.demand_probabilities)
+            if self.inventory[dish] > 0:
+                self.log_dish[customer_id - 1] = dish
+                self.manage_inventory(dish)
+                return dish, True
 
-            if available_dishes.empty:
+            self.customer_dissatisfaction += 1
+            if not (self.inventory > 0).any():
                 return None, False
-            else:
-                return self.take_order(customer_id)
-
-        
 
     def manage_inventory(self, dish):
         """
-        Update the inventory DataFrame based on the ingredients used for the dish.
+        Update the inventory based on the ingredients used for the dish.
         """
-        self.inventory_df.loc[self.inventory_df['Dish'] == dish, 'Quantity'] -= 1
+        self.inventory[dish] -= 1
         
         
     def run_simulation(self):
@@ -219,13 +314,14 @@ class RestaurantSimulator:
             
             t = max(t, (rate_index + 1) * interval_length)
       
+        self.reserve_log(len(arrival_times))
         for t in arrival_times:
             customer_id = self.generate_customer_id()
             self.schedule_event(t, 'arrival', customer_id)
 
         while self.event_queue:
             self.process_event()
-            if(self.inventory_df['Quantity'] == 0).all():
+            if (self.inventory == 0).all():
                 break
                 
 
@@ -236,30 +332,30 @@ class RestaurantSimulator:
         Calculate total revenue, total costs, and return the net profit.
         Wage per Hour
         """
-        #print(self.order_log)
-        total_revenue = self.order_log['Revenue'].sum()
+        log = self.log[:self.customer_counter]
+        total_revenue = np.nansum(log[:, REVENUE])
         #print("revenue", total_revenue)
         labor_costs = self.duration * (self.num_cooks * self.cook_wage  + self.num_servers * self.server_wage)
         # Cost of Goods Sold
-        sold_good_costs = self.order_log['Cost'].sum()
+        sold_good_costs = np.nansum(log[:, COST])
         
         # Cost 0f remaining inventory
-        inventory_costs = 0
-        merged_df = self.inventory_df.merge(self.menu_df[['Dish', 'Cost']], on='Dish', how='left')
-        merged_df['Cost'] = merged_df['Cost'].fillna(0) 
-        inventory_costs = (merged_df['Cost'] * merged_df['Quantity']).sum()
+        inventory_costs = (self.dish_cost * self.inventory).sum()
         return total_revenue - labor_costs - self.inventory_discount * inventory_costs - sold_good_costs - self.variation_factor * self.customer_dissatisfaction
     
     def transactions(self):
-        total_revenue = self.order_log['Revenue'].sum()
+        log = self.log[:self.customer_counter]
+        total_revenue = np.nansum(log[:, REVENUE])
         #print("revenue", total_revenue)
         labor_costs = self.duration * (self.num_cooks * self.cook_wage  + self.num_servers * self.server_wage)
         # Cost of Goods Sold
-        sold_good_costs = self.order_log['Cost'].sum()
+        sold_good_costs = np.nansum(log[:, COST])
         
         return  total_revenue - labor_costs - sold_good_costs
 
 if __name__ == "__main__":
+    import pandas as pd
+
     menu_data = {
             'Dish': ['Ramen', 'Sushi', 'Tsunami', 'Sakana/Okazu'],
             'Cost': [2.5, 2, 2, 3], # From Bosso meeting